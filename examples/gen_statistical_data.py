@@ -5,11 +5,23 @@ from __future__ import annotations
 
 import argparse
 import bisect
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import itertools
 import math
+import mmap
 import os
 import random
+import stat
 import sys
-from typing import Sequence
+from typing import Callable, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the stdlib samplers below are the fallback.
+    np = None
 
 
 MODES = [
@@ -47,6 +59,39 @@ MIXTURE_COMPONENT_MODES = {
     "gamma",
 }
 
+# Inclusive byte ranges for the zero, low-control, ascii and high buckets.
+BUCKET_LO = (0x00, 0x01, 0x20, 0x7F)
+BUCKET_HI = (0x00, 0x1F, 0x7E, 0xFF)
+BUCKET_RANGES = tuple(range(lo, hi + 1) for lo, hi in zip(BUCKET_LO, BUCKET_HI))
+
+# "mixed" mode bucket probabilities: 65% zero, 2% low, 25% ascii, 8% high.
+MIXED_BUCKET_WEIGHTS = (0.65, 0.02, 0.25, 0.08)
+MIXED_BUCKET_CUM_WEIGHTS = tuple(itertools.accumulate(MIXED_BUCKET_WEIGHTS))
+CLUSTERED_BUCKET_WEIGHTS = (0.55, 0.05, 0.30, 0.10)
+
+ZIPF_LUT_BITS = 16
+
+# Mean run length below which bucket runs are filled by per-byte table lookup
+# rather than one rng.integers call per run.
+RUN_LOOKUP_MAX_MEAN = 256
+
+# Unit of parallel NumPy generation; each tile gets an independent RNG stream.
+TILE_SIZE = 4 * 1024 * 1024
+
+# Tiles are generated in sub-blocks of this size from the tile's stream. That
+# caps sampler scratch per worker: ~30 bytes per output byte for most modes,
+# up to ~70 for a fast-switching markov chain. With the mapped tile, peak
+# memory is about --jobs * 12 MiB above the interpreter (--jobs * 22 MiB in
+# the markov worst case).
+SUBBLOCK_SIZE = 256 * 1024
+
+# NumPy seeds must be non-negative: --seed is reduced to 128 bits in two's
+# complement, so negative seeds work and distinct seeds stay distinct.
+SEED_MASK = (1 << 128) - 1
+
+# Largest lambda NumPy's Poisson sampler accepts (int64 max - 10 * sqrt of it).
+POISSON_LAM_MAX = (2**63 - 1) - 10.0 * math.sqrt(2**63 - 1)
+
 
 def parse_size(text: str) -> int:
     s = text.strip().lower()
@@ -151,17 +196,23 @@ def clamp_byte(value: int) -> int:
     return value
 
 
-def weighted_choice_index(rng: random.Random, weights: Sequence[float]) -> int:
-    total = sum(weights)
+def randint_inclusive(rng: random.Random, lo: int, hi: int) -> int:
+    # Cheaper than random.Random.randint, which goes through randrange.
+    return lo + int(rng.random() * (hi - lo + 1))
+
+
+def cumulative_weights(weights: Sequence[float]) -> list[float]:
+    return list(itertools.accumulate(weights))
+
+
+def weighted_choice_index(rng: random.Random, cum_weights: Sequence[float]) -> int:
+    # cum_weights comes from cumulative_weights, built once per run; the
+    # search is bisect's C loop instead of a Python scan over the weights.
+    total = cum_weights[-1]
     if total <= 0.0:
-        return len(weights) - 1
-    r = rng.random() * total
-    acc = 0.0
-    for i, w in enumerate(weights):
-        acc += w
-        if r < acc:
-            return i
-    return len(weights) - 1
+        return len(cum_weights) - 1
+    i = bisect.bisect(cum_weights, rng.random() * total)
+    return min(i, len(cum_weights) - 1)
 
 
 def sample_byte_from_bucket(rng: random.Random, bucket: int) -> int:
@@ -169,30 +220,56 @@ def sample_byte_from_bucket(rng: random.Random, bucket: int) -> int:
     if bucket == 0:
         return 0x00
     if bucket == 1:
-        return rng.randint(0x01, 0x1F)
+        return randint_inclusive(rng, 0x01, 0x1F)
     if bucket == 2:
-        return rng.randint(0x20, 0x7E)
-    return rng.randint(0x7F, 0xFF)
+        return randint_inclusive(rng, 0x20, 0x7E)
+    return randint_inclusive(rng, 0x7F, 0xFF)
 
 
 def poisson_sample(rng: random.Random, lam: float) -> int:
     if lam <= 0.0:
         return 0
 
-    # Knuth exact method for small lambda; normal approximation for larger lambda.
-    if lam < 30.0:
+    # Knuth multiplication for small lambda; it needs ~lambda uniforms per draw.
+    if lam < 10.0:
+        rand = rng.random
         limit = math.exp(-lam)
         k = 0
         prod = 1.0
         while prod > limit:
             k += 1
-            prod *= rng.random()
+            prod *= rand()
         return k - 1
 
-    approx = int(round(rng.gauss(lam, math.sqrt(lam))))
-    if approx < 0:
-        return 0
-    return approx
+    return poisson_ptrs(rng, lam)
+
+
+def poisson_ptrs(rng: random.Random, lam: float) -> int:
+    # Hormann's transformed rejection with squeeze (PTRS), as used by NumPy for
+    # lambda >= 10: exact, and ~2 uniforms per draw regardless of lambda.
+    rand = rng.random
+    slam = math.sqrt(lam)
+    loglam = math.log(lam)
+    b = 0.931 + (2.53 * slam)
+    a = -0.059 + (0.02483 * b)
+    invalpha = 1.1239 + (1.1328 / (b - 3.4))
+    vr = 0.9277 - (3.6224 / (b - 2.0))
+    while True:
+        u = rand() - 0.5
+        v = rand()
+        us = 0.5 - abs(u)
+        if us == 0.0 or v == 0.0:
+            # u == -0.5 divides by zero below, v == 0.0 takes log(0).
+            continue
+        k = math.floor((((2.0 * a) / us) + b) * u + lam + 0.43)
+        if us >= 0.07 and v <= vr:
+            return k
+        if k < 0 or (us < 0.013 and v > us):
+            continue
+        if (math.log(v) + math.log(invalpha) - math.log((a / (us * us)) + b)) <= (
+            -lam + (k * loglam) - math.lgamma(k + 1)
+        ):
+            return k
 
 
 def geometric_failures(rng: random.Random, p: float) -> int:
@@ -201,29 +278,67 @@ def geometric_failures(rng: random.Random, p: float) -> int:
         return 0
     if p <= 0.0:
         return 255
-    u = rng.random()
-    if u <= 0.0:
-        u = 1e-15
-    return int(math.floor(math.log(1.0 - u) / math.log(1.0 - p)))
+    # Inverse CDF; log1p keeps precision where log(1 - u) would cancel.
+    return math.floor(math.log1p(-rng.random()) / math.log1p(-p))
 
 
 def binomial_sample(rng: random.Random, n: int, p: float) -> int:
+    if p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+
+    # Python 3.12+ ships BG/BTRS, which is O(1) per variate for large n*p.
+    binomialvariate = getattr(rng, "binomialvariate", None)
+    if binomialvariate is not None:
+        return binomialvariate(n, p)
+
+    # Inversion (BINV) on the smaller tail: one uniform and ~n*min(p, 1-p)
+    # steps instead of n Bernoulli draws.
+    flip = p > 0.5
+    if flip:
+        p = 1.0 - p
+    q = 1.0 - p
+    r = q ** n
+    if r <= 0.0:
+        # q**n underflowed (very large n); count Bernoulli trials instead.
+        s = sum(1 for _ in range(n) if rng.random() < p)
+        return n - s if flip else s
+
+    ratio = p / q
+    a = (n + 1) * ratio
+    u = rng.random()
     s = 0
-    for _ in range(n):
-        if rng.random() < p:
-            s += 1
-    return s
+    while u > r and s < n:
+        u -= r
+        s += 1
+        r *= (a / s) - ratio
+    return n - s if flip else s
 
 
 def negative_binomial_failures(rng: random.Random, r_successes: int, p: float) -> int:
     # Returns failures before r successes.
+    if p >= 1.0:
+        return 0
+    if p <= 0.0:
+        return 255 * r_successes
+
+    # geometric_failures inlined so log1p(-p) is computed once per variate.
+    rand = rng.random
+    log_q = math.log1p(-p)
     total_failures = 0
     for _ in range(r_successes):
-        total_failures += geometric_failures(rng, p)
+        total_failures += math.floor(math.log1p(-rand()) / log_q)
     return total_failures
 
 
-def build_zipf_cdf(s: float, k_max: int) -> list[float]:
+def build_zipf_cdf(s: float, k_max: int) -> Sequence[float]:
+    if np is not None:
+        cdf = np.cumsum(np.arange(1, k_max + 1, dtype=np.float64) ** -s)
+        cdf /= cdf[-1]
+        cdf[-1] = 1.0
+        return cdf
+
     weights = [1.0 / (float(k) ** s) for k in range(1, k_max + 1)]
     total = sum(weights)
     if total <= 0.0:
@@ -237,6 +352,16 @@ def build_zipf_cdf(s: float, k_max: int) -> list[float]:
     return cdf
 
 
+def build_zipf_lut(cdf: Sequence[float]) -> np.ndarray:
+    # Rank for each of 2^ZIPF_LUT_BITS equal slices of [0, 1), so a batch draw
+    # is one table load per byte instead of a binary search. Ranks rarer than
+    # 2^-ZIPF_LUT_BITS are quantized to the slot grid.
+    slots = 1 << ZIPF_LUT_BITS
+    centers = (np.arange(slots, dtype=np.float64) + 0.5) / slots
+    ranks = np.searchsorted(cdf, centers, side="left") + 1
+    return ranks.astype(np.min_scalar_type(len(cdf)))
+
+
 def sample_zipf_index(rng: random.Random, cdf: Sequence[float]) -> int:
     r = rng.random()
     return bisect.bisect_left(cdf, r) + 1  # 1..k_max
@@ -246,62 +371,293 @@ def apply_affine(raw: float, scale: float, offset: float) -> int:
     return clamp_byte(int(round((raw * scale) + offset)))
 
 
-def sample_mode_byte(
+# Scalar sampler factories. Each reads its parameters off args and binds the
+# rng methods once, then returns a closure that draws one byte, so the
+# per-byte loop does no Namespace lookups or mode-string comparisons.
+ByteSampler = Callable[[], int]
+
+
+def make_uniform_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    return functools.partial(rng.randint, 0x00, 0xFF)
+
+
+def make_mixed_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    def sample() -> int:
+        return sample_byte_from_bucket(rng, weighted_choice_index(rng, MIXED_BUCKET_CUM_WEIGHTS))
+    return sample
+
+
+def make_bernoulli_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    rand = rng.random
+    p, one, zero = args.bernoulli_p, args.bernoulli_one, args.bernoulli_zero
+
+    def sample() -> int:
+        return one if rand() < p else zero
+    return sample
+
+
+def make_poisson_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    lam, scale, offset = args.poisson_lambda, args.poisson_scale, args.poisson_offset
+
+    def sample() -> int:
+        return apply_affine(poisson_sample(rng, lam), scale, offset)
+    return sample
+
+
+def make_binomial_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    n, p = args.binomial_n, args.binomial_p
+    scale, offset = args.binomial_scale, args.binomial_offset
+
+    def sample() -> int:
+        return apply_affine(binomial_sample(rng, n, p), scale, offset)
+    return sample
+
+
+def make_geometric_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    p, scale, offset = args.geometric_p, args.geometric_scale, args.geometric_offset
+
+    def sample() -> int:
+        return apply_affine(geometric_failures(rng, p), scale, offset)
+    return sample
+
+
+def make_negative_binomial_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    r, p = args.negbin_r, args.negbin_p
+    scale, offset = args.negbin_scale, args.negbin_offset
+
+    def sample() -> int:
+        return apply_affine(negative_binomial_failures(rng, r, p), scale, offset)
+    return sample
+
+
+def make_normal_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    gauss = rng.gauss
+    mu, sigma = args.normal_mu, args.normal_sigma
+    scale, offset = args.normal_scale, args.normal_offset
+
+    def sample() -> int:
+        return apply_affine(gauss(mu, sigma), scale, offset)
+    return sample
+
+
+def make_lognormal_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    lognormvariate = rng.lognormvariate
+    mu, sigma = args.lognormal_mu, args.lognormal_sigma
+    scale, offset = args.lognormal_scale, args.lognormal_offset
+
+    def sample() -> int:
+        return apply_affine(lognormvariate(mu, sigma), scale, offset)
+    return sample
+
+
+def make_exponential_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    expovariate = rng.expovariate
+    lam, scale, offset = args.exponential_lambda, args.exponential_scale, args.exponential_offset
+
+    def sample() -> int:
+        return apply_affine(expovariate(lam), scale, offset)
+    return sample
+
+
+def make_zipf_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    scale, offset = args.zipf_scale, args.zipf_offset
+
+    def sample() -> int:
+        return apply_affine(sample_zipf_index(rng, zipf_cdf), scale, offset)
+    return sample
+
+
+def make_beta_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    betavariate = rng.betavariate
+    a, b = args.beta_a, args.beta_b
+    scale, offset = args.beta_scale, args.beta_offset
+
+    def sample() -> int:
+        return apply_affine(betavariate(a, b), scale, offset)
+    return sample
+
+
+def make_gamma_sampler(args: argparse.Namespace, rng: random.Random, zipf_cdf: Sequence[float]) -> ByteSampler:
+    gammavariate = rng.gammavariate
+    shape, theta = args.gamma_shape, args.gamma_theta
+    scale, offset = args.gamma_byte_scale, args.gamma_offset
+
+    def sample() -> int:
+        return apply_affine(gammavariate(shape, theta), scale, offset)
+    return sample
+
+
+MODE_SAMPLER_FACTORIES: dict[str, Callable[[argparse.Namespace, random.Random, Sequence[float]], ByteSampler]] = {
+    "uniform": make_uniform_sampler,
+    "mixed": make_mixed_sampler,
+    "bernoulli": make_bernoulli_sampler,
+    "poisson": make_poisson_sampler,
+    "binomial": make_binomial_sampler,
+    "geometric": make_geometric_sampler,
+    "negative_binomial": make_negative_binomial_sampler,
+    "normal": make_normal_sampler,
+    "lognormal": make_lognormal_sampler,
+    "exponential": make_exponential_sampler,
+    "zipf": make_zipf_sampler,
+    "beta": make_beta_sampler,
+    "gamma": make_gamma_sampler,
+}
+
+
+def make_byte_sampler(
     mode: str,
     args: argparse.Namespace,
     rng: random.Random,
     zipf_cdf: Sequence[float],
-) -> int:
+) -> ByteSampler:
+    factory = MODE_SAMPLER_FACTORIES.get(mode)
+    if factory is None:
+        raise ValueError(f"unsupported sampling mode: {mode}")
+    return factory(args, rng, zipf_cdf)
+
+
+def affine_batch(raw: np.ndarray, scale: float, offset: float, out: np.ndarray) -> None:
+    # In-place passes over one float64 scratch buffer; float64 keeps large
+    # raw * scale products exact enough that the clip lands on the right
+    # side, and only the clipped byte values are narrowed. A float64 raw is
+    # a fresh sampler result and is reused as the buffer. Adding 0.5 before
+    # the truncating cast rounds (ties up) without np.rint.
+    buf = raw if raw.dtype == np.float64 else np.empty(len(out), dtype=np.float64)
+    np.multiply(raw, scale, out=buf)
+    np.add(buf, offset + 0.5, out=buf)
+    np.clip(buf, 0, 255, out=buf)
+    np.copyto(out, buf, casting="unsafe")
+
+
+def sample_bytes_from_buckets(rng: np.random.Generator, buckets: np.ndarray) -> np.ndarray:
+    # Per-byte table lookup: scale a 32-bit uniform into the bucket's width by
+    # multiply-shift, then add the bucket's low byte. About twice as fast as
+    # rng.integers with per-element bounds.
+    lo = np.asarray(BUCKET_LO, dtype=np.uint8)
+    width = np.asarray([(hi - lo_b) + 1 for lo_b, hi in zip(BUCKET_LO, BUCKET_HI)], dtype=np.uint64)
+    draws = rng.integers(0, 1 << 32, len(buckets), dtype=np.uint64)
+    draws *= width[buckets]
+    draws >>= np.uint64(32)
+    out = draws.astype(np.uint8)
+    out += lo[buckets]
+    return out
+
+
+def build_alias(weights: Sequence[float]) -> tuple[np.ndarray, np.ndarray]:
+    # Vose's alias method: each weighted draw is one bucket pick plus one
+    # biased coin, independent of the number of weights.
+    n = len(weights)
+    total = float(sum(weights))
+    scaled = [(w * n) / total for w in weights]
+    prob = np.ones(n, dtype=np.float64)
+    alias = np.arange(n, dtype=np.intp)
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        lo = small.pop()
+        hi = large.pop()
+        prob[lo] = scaled[lo]
+        alias[lo] = hi
+        scaled[hi] -= 1.0 - scaled[lo]
+        (small if scaled[hi] < 1.0 else large).append(hi)
+    return prob, alias
+
+
+def sample_alias(
+    rng: np.random.Generator,
+    table: tuple[np.ndarray, np.ndarray],
+    size: int,
+) -> np.ndarray:
+    prob, alias = table
+    k = rng.integers(0, len(prob), size)
+    return np.where(rng.random(size) < prob[k], k, alias[k])
+
+
+def geometric_failures_batch(rng: np.random.Generator, p: float, size: int) -> np.ndarray:
+    # Vector form of geometric_failures, computed in place on the uniform draw.
+    if p >= 1.0:
+        return np.zeros(size)
+    raw = rng.random(size)
+    np.negative(raw, out=raw)
+    np.log1p(raw, out=raw)
+    raw /= math.log1p(-p)
+    return np.floor(raw, out=raw)
+
+
+def fill_mode_batch(
+    mode: str,
+    args: argparse.Namespace,
+    rng: np.random.Generator,
+    zipf_lut: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    # Vectorized counterpart of MODE_SAMPLER_FACTORIES: one Generator call per mode.
+    size = len(out)
     if mode == "uniform":
-        return rng.randint(0x00, 0xFF)
+        out[:] = rng.integers(0x00, 0xFF, size=size, dtype=np.uint8, endpoint=True)
+        return
 
     if mode == "mixed":
-        # Probabilities: 65% zero, 2% low, 25% ascii, 8% high.
-        b = weighted_choice_index(rng, [0.65, 0.02, 0.25, 0.08])
-        return sample_byte_from_bucket(rng, b)
+        buckets = sample_alias(rng, build_alias(MIXED_BUCKET_WEIGHTS), size)
+        out[:] = sample_bytes_from_buckets(rng, buckets)
+        return
 
     if mode == "bernoulli":
-        return args.bernoulli_one if rng.random() < args.bernoulli_p else args.bernoulli_zero
+        # Branchless masked select straight into the output bytes.
+        hits = rng.random(size) < args.bernoulli_p
+        out.fill(args.bernoulli_zero)
+        np.copyto(out, args.bernoulli_one, where=hits)
+        return
 
     if mode == "poisson":
-        raw = poisson_sample(rng, args.poisson_lambda)
-        return apply_affine(raw, args.poisson_scale, args.poisson_offset)
+        raw = rng.poisson(args.poisson_lambda, size)
+        affine_batch(raw, args.poisson_scale, args.poisson_offset, out)
+        return
 
     if mode == "binomial":
-        raw = binomial_sample(rng, args.binomial_n, args.binomial_p)
-        return apply_affine(raw, args.binomial_scale, args.binomial_offset)
+        raw = rng.binomial(args.binomial_n, args.binomial_p, size)
+        affine_batch(raw, args.binomial_scale, args.binomial_offset, out)
+        return
 
     if mode == "geometric":
-        raw = geometric_failures(rng, args.geometric_p)
-        return apply_affine(raw, args.geometric_scale, args.geometric_offset)
+        raw = geometric_failures_batch(rng, args.geometric_p, size)
+        affine_batch(raw, args.geometric_scale, args.geometric_offset, out)
+        return
 
     if mode == "negative_binomial":
-        raw = negative_binomial_failures(rng, args.negbin_r, args.negbin_p)
-        return apply_affine(raw, args.negbin_scale, args.negbin_offset)
+        raw = rng.negative_binomial(args.negbin_r, args.negbin_p, size)
+        affine_batch(raw, args.negbin_scale, args.negbin_offset, out)
+        return
 
     if mode == "normal":
-        raw = rng.gauss(args.normal_mu, args.normal_sigma)
-        return apply_affine(raw, args.normal_scale, args.normal_offset)
+        raw = rng.normal(args.normal_mu, args.normal_sigma, size)
+        affine_batch(raw, args.normal_scale, args.normal_offset, out)
+        return
 
     if mode == "lognormal":
-        raw = rng.lognormvariate(args.lognormal_mu, args.lognormal_sigma)
-        return apply_affine(raw, args.lognormal_scale, args.lognormal_offset)
+        raw = rng.lognormal(args.lognormal_mu, args.lognormal_sigma, size)
+        affine_batch(raw, args.lognormal_scale, args.lognormal_offset, out)
+        return
 
     if mode == "exponential":
-        raw = rng.expovariate(args.exponential_lambda)
-        return apply_affine(raw, args.exponential_scale, args.exponential_offset)
+        raw = rng.exponential(1.0 / args.exponential_lambda, size)
+        affine_batch(raw, args.exponential_scale, args.exponential_offset, out)
+        return
 
     if mode == "zipf":
-        raw = sample_zipf_index(rng, zipf_cdf)
-        return apply_affine(raw, args.zipf_scale, args.zipf_offset)
+        raw = zipf_lut[rng.integers(0, 1 << ZIPF_LUT_BITS, size, dtype=np.uint16)]
+        affine_batch(raw, args.zipf_scale, args.zipf_offset, out)
+        return
 
     if mode == "beta":
-        raw = rng.betavariate(args.beta_a, args.beta_b)
-        return apply_affine(raw, args.beta_scale, args.beta_offset)
+        raw = rng.beta(args.beta_a, args.beta_b, size)
+        affine_batch(raw, args.beta_scale, args.beta_offset, out)
+        return
 
     if mode == "gamma":
-        raw = rng.gammavariate(args.gamma_shape, args.gamma_theta)
-        return apply_affine(raw, args.gamma_byte_scale, args.gamma_offset)
+        raw = rng.gamma(args.gamma_shape, args.gamma_theta, size)
+        affine_batch(raw, args.gamma_byte_scale, args.gamma_offset, out)
+        return
 
     raise ValueError(f"unsupported sampling mode: {mode}")
 
@@ -313,24 +669,75 @@ def generate_independent_mode(
     size: int,
     zipf_cdf: Sequence[float],
 ) -> bytearray:
+    sample = make_byte_sampler(mode, args, rng, zipf_cdf)
     out = bytearray(size)
     for i in range(size):
-        out[i] = sample_mode_byte(mode, args, rng, zipf_cdf)
+        out[i] = sample()
     return out
 
 
+def fill_bucket_runs(
+    rng: np.random.Generator,
+    out: np.ndarray,
+    buckets: np.ndarray,
+    runs: np.ndarray,
+) -> None:
+    # The runs must cover at least len(out) bytes; they are clipped to it.
+    ends = np.minimum(np.cumsum(runs), len(out))
+    lengths = np.diff(ends, prepend=0)
+    if len(out) < RUN_LOOKUP_MAX_MEAN * len(lengths):
+        # Short runs: expand each run's bucket to every byte it covers and
+        # sample all bytes in one table-lookup pass.
+        out[:] = sample_bytes_from_buckets(rng, np.repeat(buckets, lengths))
+        return
+
+    # Long runs: one rng.integers call per run beats per-byte lookups.
+    start = 0
+    for bucket, end in zip(buckets.tolist(), ends.tolist()):
+        if end > start:
+            lo = BUCKET_LO[bucket]
+            hi = BUCKET_HI[bucket]
+            if lo == hi:
+                out[start:end] = lo
+            else:
+                out[start:end] = rng.integers(lo, hi, end - start, dtype=np.uint8, endpoint=True)
+        start = end
+
+
+def fill_clustered_batch(rng: np.random.Generator, out: np.ndarray) -> None:
+    size = len(out)
+    table = build_alias(CLUSTERED_BUCKET_WEIGHTS)
+    buckets: list[np.ndarray] = []
+    runs: list[np.ndarray] = []
+    covered = 0
+    while covered < size:
+        # Blocks average ~2.4 KiB, so one round of block decisions usually
+        # covers the output; any shortfall is drawn in another round.
+        count = ((size - covered) // 2048) + 16
+        long_run = rng.random(count) < 0.15
+        lengths = np.where(
+            long_run,
+            rng.integers(4096, 16384, count, endpoint=True),
+            rng.integers(64, 2048, count, endpoint=True),
+        )
+        buckets.append(sample_alias(rng, table, count))
+        runs.append(lengths)
+        covered += int(lengths.sum())
+    fill_bucket_runs(rng, out, np.concatenate(buckets), np.concatenate(runs))
+
+
 def generate_clustered(rng: random.Random, size: int) -> bytearray:
-    bucket_weights = [0.55, 0.05, 0.30, 0.10]
+    cum_weights = cumulative_weights(CLUSTERED_BUCKET_WEIGHTS)
     out = bytearray()
 
     while len(out) < size:
-        bucket = weighted_choice_index(rng, bucket_weights)
+        bucket = weighted_choice_index(rng, cum_weights)
 
         # Most blocks are moderate length, some are long to create obvious regions.
         if rng.random() < 0.15:
-            run = rng.randint(4096, 16384)
+            run = randint_inclusive(rng, 4096, 16384)
         else:
-            run = rng.randint(64, 2048)
+            run = randint_inclusive(rng, 64, 2048)
 
         remaining = size - len(out)
         run = min(run, remaining)
@@ -339,19 +746,116 @@ def generate_clustered(rng: random.Random, size: int) -> bytearray:
             out.extend(b"\x00" * run)
             continue
 
-        for _ in range(run):
-            out.append(sample_byte_from_bucket(rng, bucket))
+        # random.choices draws the whole run in one call.
+        out.extend(rng.choices(BUCKET_RANGES[bucket], k=run))
 
     return out
 
 
+def fill_markov_batch(
+    rng: np.random.Generator,
+    out: np.ndarray,
+    stay_prob: float,
+    init_weights: Sequence[float],
+    state: int | None = None,
+) -> int:
+    # The chain redraws its state with probability 1 - stay_prob per byte, so
+    # run lengths are Geometric(1 - stay_prob): draw whole runs instead of bytes.
+    # Returns the final state; passing it back as `state` continues the chain
+    # into the next block. The carried run's remaining length is then the
+    # number of stays before the next redraw, which may be 0 (geometric run
+    # lengths are memoryless).
+    size = len(out)
+    switch_prob = 1.0 - stay_prob
+    if switch_prob <= 0.0:
+        runs = np.array([size])
+    else:
+        count = int(size * switch_prob) + 16
+        runs = rng.geometric(switch_prob, count)
+        if state is not None:
+            runs[0] -= 1
+        while runs.sum() < size:
+            runs = np.concatenate((runs, rng.geometric(switch_prob, count)))
+    states = sample_alias(rng, build_alias(init_weights), len(runs))
+    if state is not None:
+        states[0] = state
+    fill_bucket_runs(rng, out, states, runs)
+    return int(states[np.searchsorted(np.cumsum(runs), size)])
+
+
+def plan_markov_tiles(
+    rng: np.random.Generator,
+    size: int,
+    stay_prob: float,
+    init_weights: Sequence[float],
+) -> list[tuple[int | None, int | None]]:
+    # Redraws happen independently of the states, so one serial pass can decide
+    # for every tile whether it holds a redraw (the first tile always does) and
+    # which state its last redraw picks. Each tile is then filled on its own
+    # as a slice of the one chain. Entries are (state entering the tile, state
+    # after its last redraw or None if it has none).
+    lengths = [min(TILE_SIZE, size - start) for start in range(0, size, TILE_SIZE)]
+    hits = rng.random(len(lengths)) < [1.0 - stay_prob ** n for n in lengths]
+    hits[0] = True
+    lasts = sample_alias(rng, build_alias(init_weights), len(lengths)).tolist()
+    plan: list[tuple[int | None, int | None]] = []
+    state = None
+    for hit, last in zip(hits.tolist(), lasts):
+        plan.append((state, last if hit else None))
+        if hit:
+            state = last
+    return plan
+
+
+def fill_markov_tile(
+    rng: np.random.Generator,
+    out: np.ndarray,
+    stay_prob: float,
+    init_weights: Sequence[float],
+    entry: int | None,
+    last: int | None,
+) -> None:
+    # Fill one tile of the chain planned by plan_markov_tiles: the bytes up to
+    # its last redraw run the chain from `entry`, the rest hold `last`.
+    size = len(out)
+    if last is None:
+        split, last = 0, entry
+    else:
+        if stay_prob <= 0.0:
+            tail = 0
+        elif stay_prob >= 1.0:
+            tail = size - 1
+        else:
+            # Stays after the last redraw, by inverse CDF counting back from
+            # the tile's end. A tile entered with a state was planned to hold
+            # a redraw, so the draw is conditioned on one falling inside it.
+            u = rng.random()
+            if entry is not None:
+                u *= 1.0 - stay_prob ** size
+            tail = min(int(math.log1p(-u) / math.log(stay_prob)), size - 1)
+        split = size - 1 - tail
+
+    state = entry
+    for start in range(0, split, SUBBLOCK_SIZE):
+        block = out[start:min(start + SUBBLOCK_SIZE, split)]
+        state = fill_markov_batch(rng, block, stay_prob, init_weights, state)
+    for start in range(split, size, SUBBLOCK_SIZE):
+        fill_markov_batch(rng, out[start:start + SUBBLOCK_SIZE], 1.0, init_weights, last)
+
+
 def generate_markov(rng: random.Random, size: int, stay_prob: float, init_weights: Sequence[float]) -> bytearray:
-    out = bytearray(size)
-    state = weighted_choice_index(rng, init_weights)
-    for i in range(size):
-        if i > 0 and rng.random() >= stay_prob:
-            state = weighted_choice_index(rng, init_weights)
-        out[i] = sample_byte_from_bucket(rng, state)
+    # Same run structure as fill_markov_batch: the state holds for
+    # 1 + geometric_failures(1 - stay_prob) bytes, then is redrawn.
+    cum_weights = cumulative_weights(init_weights)
+    out = bytearray()
+    while len(out) < size:
+        state = weighted_choice_index(rng, cum_weights)
+        if stay_prob >= 1.0:
+            run = size
+        else:
+            run = 1 + geometric_failures(rng, 1.0 - stay_prob)
+        run = min(run, size - len(out))
+        out.extend(rng.choices(BUCKET_RANGES[state], k=run))
     return out
 
 
@@ -375,27 +879,195 @@ def parse_mixture_spec(args: argparse.Namespace) -> tuple[list[str], list[float]
     return comps, weights
 
 
+def fill_mixture_batch(
+    rng: np.random.Generator,
+    args: argparse.Namespace,
+    zipf_lut: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    components, weights = args._mixture_spec
+    picks = sample_alias(rng, build_alias(weights), len(out))
+    for idx, comp in enumerate(components):
+        mask = picks == idx
+        part = np.empty(int(np.count_nonzero(mask)), dtype=np.uint8)
+        fill_mode_batch(comp, args, rng, zipf_lut, part)
+        out[mask] = part
+
+
 def generate_mixture(
     rng: random.Random,
     args: argparse.Namespace,
     size: int,
     zipf_cdf: Sequence[float],
 ) -> bytearray:
-    components, weights = parse_mixture_spec(args)
+    components, weights = args._mixture_spec
+    samplers = [make_byte_sampler(comp, args, rng, zipf_cdf) for comp in components]
+    cum_weights = cumulative_weights(weights)
     out = bytearray(size)
     for i in range(size):
-        idx = weighted_choice_index(rng, weights)
-        out[i] = sample_mode_byte(components[idx], args, rng, zipf_cdf)
+        idx = weighted_choice_index(rng, cum_weights)
+        out[i] = samplers[idx]()
     return out
 
 
-def print_stats(data: bytes) -> None:
-    total = len(data)
-    zero = sum(1 for b in data if b == 0x00)
-    low = sum(1 for b in data if 0x01 <= b <= 0x1F)
-    ascii_n = sum(1 for b in data if 0x20 <= b <= 0x7E)
-    high = sum(1 for b in data if 0x7F <= b <= 0xFF)
-    mean = (sum(data) / total) if total else 0.0
+def fill_tile(
+    args: argparse.Namespace,
+    rng: np.random.Generator,
+    zipf_lut: np.ndarray,
+    out: np.ndarray,
+    markov_entry: tuple[int | None, int | None] | None = None,
+) -> None:
+    if args.mode == "markov":
+        fill_markov_tile(rng, out, args.markov_stay, args._markov_weights, *markov_entry)
+        return
+    if args.mode == "clustered":
+        # Already bounded: blocks are filled one rng.integers call each, and
+        # the block tables hold only ~1 entry per 2 KiB.
+        fill_clustered_batch(rng, out)
+        return
+
+    for start in range(0, len(out), SUBBLOCK_SIZE):
+        block = out[start:start + SUBBLOCK_SIZE]
+        if args.mode in MIXTURE_COMPONENT_MODES:
+            fill_mode_batch(args.mode, args, rng, zipf_lut, block)
+        elif args.mode == "mixture":
+            fill_mixture_batch(rng, args, zipf_lut, block)
+        else:
+            raise ValueError(f"unsupported mode: {args.mode}")
+
+
+def fill_window(
+    args: argparse.Namespace,
+    zipf_lut: np.ndarray,
+    seeds: Sequence[np.random.SeedSequence],
+    markov_plan: Sequence[tuple[int | None, int | None]] | None,
+    window_start: int,
+    out: np.ndarray,
+    pool: concurrent.futures.Executor,
+) -> None:
+    # Fixed-size tiles, each with its own child stream of the seed, so the
+    # output depends only on --seed and never on --jobs or the window size.
+    # The markov chain continues across tiles through markov_plan; clustered
+    # blocks restart at every tile. Generator calls release the GIL, so
+    # threads are enough to fill tiles in parallel.
+    def work(start: int) -> None:
+        tile = (window_start + start) // TILE_SIZE
+        entry = markov_plan[tile] if markov_plan is not None else None
+        fill_tile(args, make_rng(seeds[tile]), zipf_lut, out[start:start + TILE_SIZE], entry)
+
+    for _ in pool.map(work, range(0, len(out), TILE_SIZE)):
+        pass
+
+
+def generate_output(
+    args: argparse.Namespace,
+    rng: random.Random,
+    zipf_cdf: Sequence[float],
+) -> bytearray:
+    if args.mode in MIXTURE_COMPONENT_MODES:
+        return generate_independent_mode(args.mode, rng, args, args.size, zipf_cdf)
+    if args.mode == "clustered":
+        return generate_clustered(rng, args.size)
+    if args.mode == "markov":
+        return generate_markov(rng, args.size, args.markov_stay, args._markov_weights)
+    if args.mode == "mixture":
+        return generate_mixture(rng, args, args.size, zipf_cdf)
+    raise ValueError(f"unsupported mode: {args.mode}")
+
+
+def write_all(fd: int, data: np.ndarray) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def write_output_mapped(args: argparse.Namespace, zipf_cdf: Sequence[float]) -> Sequence[int] | None:
+    # Generate straight into shared mappings of the output file, so the bytes
+    # land in the page cache once with no user-space buffer copied to the
+    # kernel. Only one window of jobs * TILE_SIZE bytes is mapped at a time and
+    # dropped from the cache once flushed, which keeps memory flat for --size 1g.
+    zipf_lut = build_zipf_lut(zipf_cdf)
+    root = np.random.SeedSequence(args.seed & SEED_MASK)
+    seeds = root.spawn(-(-args.size // TILE_SIZE))
+    markov_plan = None
+    if args.mode == "markov":
+        markov_plan = plan_markov_tiles(
+            make_rng(root.spawn(1)[0]), args.size, args.markov_stay, args._markov_weights
+        )
+    window = TILE_SIZE * args.jobs
+    hist = None if args.no_stats else np.zeros(256, dtype=np.int64)
+    try:
+        regular = stat.S_ISREG(os.stat(args.output).st_mode)
+    except FileNotFoundError:
+        regular = True
+    # A pipe reopened read-write through /dev/stdout would count as its own
+    # reader and block forever instead of raising EPIPE, so only regular
+    # files are opened O_RDWR for mapping.
+    flags = os.O_RDWR | os.O_CREAT | os.O_TRUNC if regular else os.O_WRONLY
+    fd = os.open(args.output, flags, 0o666)
+    done = False
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            if regular:
+                os.ftruncate(fd, args.size)
+                for start in range(0, args.size, window):
+                    length = min(window, args.size - start)
+                    # Not a with-block: if filling raises, the traceback still
+                    # holds views of the mapping and closing it would replace
+                    # the real error with BufferError. It is unmapped once
+                    # those views are gone.
+                    mm = mmap.mmap(fd, length, offset=start)
+                    out = np.frombuffer(mm, dtype=np.uint8)
+                    fill_window(args, zipf_lut, seeds, markov_plan, start, out, pool)
+                    if hist is not None:
+                        hist += byte_histogram(out)
+                    del out  # the mapping cannot close while the array still exports it
+                    mm.flush()
+                    mm.close()
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(fd, start, length, os.POSIX_FADV_DONTNEED)
+            else:
+                # Pipes and character devices (/dev/stdout, /dev/null) can be
+                # neither truncated nor mapped: fill one reused window buffer
+                # and stream it out instead.
+                buf = np.empty(min(window, args.size), dtype=np.uint8)
+                for start in range(0, args.size, window):
+                    out = buf[:min(window, args.size - start)]
+                    fill_window(args, zipf_lut, seeds, markov_plan, start, out, pool)
+                    if hist is not None:
+                        hist += byte_histogram(out)
+                    write_all(fd, out)
+        done = True
+    finally:
+        os.close(fd)
+        if regular and not done:
+            # Do not leave a file that looks complete but is zero-filled.
+            os.unlink(args.output)
+    return hist
+
+
+def is_stdout(path: str) -> bool:
+    try:
+        return os.path.samestat(os.stat(path), os.fstat(sys.stdout.fileno()))
+    except (OSError, ValueError):
+        return False
+
+
+def byte_histogram(data: bytes | np.ndarray) -> Sequence[int]:
+    if np is not None:
+        return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    counts = collections.Counter(data)
+    return [counts[b] for b in range(256)]
+
+
+def print_stats(hist: Sequence[int]) -> None:
+    # Every figure below is derived from the 256 byte counts.
+    total = int(sum(hist))
+    zero = int(hist[0x00])
+    low = int(sum(hist[0x01:0x20]))
+    ascii_n = int(sum(hist[0x20:0x7F]))
+    high = int(sum(hist[0x7F:0x100]))
+    mean = (sum(b * int(n) for b, n in enumerate(hist)) / total) if total else 0.0
 
     def pct(n: int) -> float:
         return (100.0 * n / total) if total else 0.0
@@ -441,6 +1113,13 @@ def build_parser() -> argparse.ArgumentParser:
         default=42,
         help="PRNG seed (default: 42)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=parse_positive_int,
+        default=os.cpu_count() or 1,
+        help="worker threads when NumPy is available; output does not depend on it (default: CPU count)",
+    )
     parser.add_argument(
         "--mode",
         choices=MODES,
@@ -548,6 +1227,8 @@ def validate_args(args: argparse.Namespace) -> None:
         raise ValueError("geometric-p must be > 0")
     if args.negbin_p <= 0.0:
         raise ValueError("negbin-p must be > 0")
+    if not args.poisson_lambda <= POISSON_LAM_MAX:
+        raise ValueError(f"poisson-lambda must be <= {POISSON_LAM_MAX:.6g}")
 
     markov_weights = parse_csv_floats(args.markov_init_weights)
     if len(markov_weights) != 4:
@@ -558,6 +1239,19 @@ def validate_args(args: argparse.Namespace) -> None:
         raise ValueError("markov-init-weights sum must be > 0")
     args._markov_weights = markov_weights
 
+    if args.mode == "mixture":
+        args._mixture_spec = parse_mixture_spec(args)
+
+
+def make_rng(seed: int | np.random.SeedSequence) -> random.Random | np.random.Generator:
+    if np is not None:
+        # PCG64DXSM: cheaper 64-bit output mixing than MT19937 and 256 bits of
+        # state instead of ~2.5 KiB.
+        if isinstance(seed, int):
+            seed &= SEED_MASK
+        return np.random.Generator(np.random.PCG64DXSM(seed))
+    return random.Random(seed)
+
 
 def main() -> int:
     parser = build_parser()
@@ -577,34 +1271,29 @@ def main() -> int:
         )
         return 1
 
-    rng = random.Random(args.seed)
     zipf_cdf = build_zipf_cdf(args.zipf_s, args.zipf_k_max)
 
-    if args.mode in MIXTURE_COMPONENT_MODES:
-        data = generate_independent_mode(args.mode, rng, args, args.size, zipf_cdf)
-    elif args.mode == "clustered":
-        data = generate_clustered(rng, args.size)
-    elif args.mode == "markov":
-        data = generate_markov(rng, args.size, args.markov_stay, args._markov_weights)
-    elif args.mode == "mixture":
-        try:
-            data = generate_mixture(rng, args, args.size, zipf_cdf)
-        except ValueError as exc:
-            print(str(exc), file=sys.stderr)
-            return 1
-    else:
-        print(f"unsupported mode: {args.mode}", file=sys.stderr)
+    try:
+        if np is not None:
+            hist = write_output_mapped(args, zipf_cdf)
+        else:
+            data = generate_output(args, make_rng(args.seed), zipf_cdf)
+            with open(args.output, "wb") as f:
+                f.write(data)
+            hist = None if args.no_stats else byte_histogram(data)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
         return 1
 
-    with open(args.output, "wb") as f:
-        f.write(data)
-
-    print(
-        f"wrote {len(data)} bytes to {args.output} "
-        f"(mode={args.mode}, seed={args.seed})"
-    )
-    if not args.no_stats:
-        print_stats(data)
+    # With -o /dev/stdout the summary would be mixed into the data itself.
+    report = sys.stderr if is_stdout(args.output) else sys.stdout
+    with contextlib.redirect_stdout(report):
+        print(
+            f"wrote {args.size} bytes to {args.output} "
+            f"(mode={args.mode}, seed={args.seed})"
+        )
+        if hist is not None:
+            print_stats(hist)
     return 0
 
 